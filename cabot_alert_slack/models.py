@@ -7,17 +7,98 @@ from cabot.cabotapp.alert import AlertPlugin, AlertPluginUserData
 from cabot.cabotapp.utils import build_absolute_url
 from cabot.metricsapp.models import MetricsStatusCheckBase
 
+import json
 import requests
 import logging
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3.util.retry import Retry
 
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from django.contrib.auth.models import User
     from cabot.cabotapp.models import Service
-    from typing import Any, Dict, List, Iterable, Set, Tuple
+    from typing import Any, Dict, List, Iterable, Optional, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
+# how long cached Slack lookups (email -> user ID, channel members) stay valid
+CACHE_TTL_SECONDS = 5 * 60
+
+# shared session for all Slack calls: connection pooling keeps TCP+TLS
+# connections alive between requests (requests.get/post would pay a fresh
+# handshake per call), and transient server errors are retried with backoff.
+# Slack sends Retry-After on 429s; urllib3 honors it (sleeping that long
+# instead of backing off blindly), so rate-limited calls wait and resume
+# rather than aborting the whole alert. Slack API posts are idempotent enough
+# to retry (worst case a duplicate alert message), so POST is whitelisted too.
+# raise_on_status=False makes urllib3 hand back the final response once the
+# attempts are exhausted instead of raising RetryError (which our handlers
+# don't catch); raise_for_status() in _check_response then raises the
+# HTTPError they expect.
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504],
+                      method_whitelist=frozenset(['GET', 'POST']),
+                      respect_retry_after_header=True,
+                      raise_on_status=False),
+))
+
+# per-user email lookups fail fast instead: a user we can't resolve right now
+# just lands in missing_users, so sleeping through Retry-After (potentially
+# tens of seconds) would delay the whole alert for no benefit
+_LOOKUP_SESSION = requests.Session()
+_LOOKUP_SESSION.mount('https://', HTTPAdapter(pool_maxsize=16))
+
+# shared pool for fanning out independent Slack lookups; reused across alerts
+# to avoid paying thread startup cost on every send
+_EXECUTOR = ThreadPoolExecutor(max_workers=8)
+
+_CACHE_LOCK = threading.Lock()
+# (api_url, email) -> (expiry, slack user ID or None if the email wasn't found)
+_EMAIL_CACHE = {}  # type: Dict[Tuple[str, str], Tuple[float, Optional[str]]]
+# (api_url, channel_id) -> (expiry, set of member user IDs)
+_CHANNEL_MEMBERS_CACHE = {}  # type: Dict[Tuple[str, str], Tuple[float, Set[str]]]
+# api_url -> (expiry, email -> user ID map for the whole workspace)
+_USER_LIST_CACHE = {}  # type: Dict[str, Tuple[float, Dict[str, str]]]
+# (api_url, channel_id) pairs the bot has already joined (or can't join, for
+# private channels) this process; conversations.join is idempotent but costs
+# an HTTP round-trip on every alert otherwise
+_JOINED_CHANNELS = set()  # type: Set[Tuple[str, str]]
+
+# with at least this many users needing email lookups, one paginated users.list
+# call is cheaper than a (more heavily rate-limited) lookupByEmail call each
+USER_LIST_MIN_USERS = 3
+
+
+def _cache_get(cache, key):
+    # type: (Dict[Any, Tuple[float, Any]], Any) -> Optional[Tuple[float, Any]]
+    """Return the (expiry, value) entry for key, or None if missing/expired."""
+    with _CACHE_LOCK:
+        entry = cache.get(key)
+        if entry is None:
+            return None
+        if time.time() > entry[0]:
+            del cache[key]
+            return None
+        return entry
+
+
+def _cache_set(cache, key, value):
+    # type: (Dict[Any, Tuple[float, Any]], Any, Any) -> None
+    with _CACHE_LOCK:
+        cache[key] = (time.time() + CACHE_TTL_SECONDS, value)
+
+
+def _cache_invalidate(cache, key):
+    # type: (Dict[Any, Tuple[float, Any]], Any) -> None
+    with _CACHE_LOCK:
+        cache.pop(key, None)
+
 # if a user's ID matches this, they won't be @mentioned or called out
 # this is useful for dummy users (PagerDuty, mailing list users, etc.)
 IGNORE_USER_ID = 'ignore'
@@ -30,8 +111,23 @@ EMOJIS = {
     'ACKED': ":zipper_mouth_face:",
 }
 
+# template for the per-check accessory button; copied per block (with a fresh
+# nested text dict) instead of rebuilding every literal in the loop
+_BUTTON_TEMPLATE = {
+    "type": "button",
+    "text": {
+        "type": "plain_text",
+        "text": '',
+        "emoji": False,
+    },
+    "url": '',
+    "action_id": "button-status",
+}
+
 
 class SlackAPIError(Exception):
+    __slots__ = ('error_type', 'errors')
+
     def __init__(self, error_type, errors):
         # type: (str, List[str]) -> None
         self.error_type = error_type
@@ -45,15 +141,45 @@ class SlackAPIError(Exception):
 
 
 def _check_response(response, check_ok=True):
-    # type: (requests.Response, bool) -> None
-    """Raise for status, but include the full response in the exception to show error messages"""
+    # type: (requests.Response, bool) -> Optional[Dict[str, Any]]
+    """
+    Raise for status, but include the full response in the exception to show error messages.
+    Returns the parsed JSON body so callers don't have to re-parse it
+    (or None with check_ok=False, since non-API responses may not be JSON).
+    """
     try:
         response.raise_for_status()
     except requests.HTTPError as e:
         raise requests.HTTPError(e.message + ', response body: ' + response.text, response=response)
 
-    if check_ok and not response.json().get('ok'):
-        raise SlackAPIError(response.json().get('error', '<error field missing>'), response.json().get('errors'))
+    if not check_ok:
+        return None
+    data = response.json()
+    if check_ok and not data.get('ok'):
+        raise SlackAPIError(data.get('error', '<error field missing>'), data.get('errors'))
+    return data
+
+
+# (server_url, access_token) -> (api_url, headers); one entry per Slack
+# instance, so no eviction needed. Callers must not mutate the shared headers.
+_API_CACHE = {}  # type: Dict[Tuple[str, str], Tuple[str, Dict[str, str]]]
+
+
+def _build_slack_api(server_url, access_token):
+    # type: (str, str) -> Tuple[str, Dict[str, str]]
+    """Build (and memoize) the API endpoint URL and auth headers for a Slack instance."""
+    key = (server_url, access_token)
+    cached = _API_CACHE.get(key)
+    if cached is None:
+        # guarantee the trailing slash so helpers can append method names
+        # directly instead of re-parsing the URL with urljoin on every call
+        api_url = urljoin(server_url, 'api/')
+        if not api_url.endswith('/'):
+            api_url += '/'
+        cached = _API_CACHE[key] = (api_url, {
+            'Authorization': 'Bearer {}'.format(access_token),
+        })
+    return cached
 
 
 def _get_slack_api_for_service(service):
@@ -73,10 +199,7 @@ def _get_slack_api_for_service(service):
     if not channel_id:
         raise RuntimeError('Slack channel ID not set.')
 
-    api_url = urljoin(server_url, 'api/')
-    headers = {
-        'Authorization': 'Bearer {}'.format(access_token),
-    }
+    api_url, headers = _build_slack_api(server_url, access_token)
     return api_url, headers, channel_id
 
 
@@ -93,62 +216,164 @@ class SlackAlert(AlertPlugin):
         :param email: email to look up
         :return: slack user ID
         """
-        response = requests.get(urljoin(url, 'users.lookupByEmail'), headers=headers, params={
+        cached = _cache_get(_EMAIL_CACHE, (url, email))
+        if cached is not None:
+            user_id = cached[1]
+            if user_id is None:
+                # negative entry - the email wasn't found last time we asked
+                raise SlackAPIError('users_not_found', None)
+            return user_id
+
+        response = _LOOKUP_SESSION.get(url + 'users.lookupByEmail', headers=headers, params={
             'email': email
         })
-        _check_response(response)
-        return response.json()['user']['id']
+        try:
+            data = _check_response(response)
+        except SlackAPIError as e:
+            if e.error_type == 'users_not_found':
+                # remember the miss so repeated alerts don't re-hit the API
+                _cache_set(_EMAIL_CACHE, (url, email), None)
+            raise
+        user_id = data['user']['id']
+        _cache_set(_EMAIL_CACHE, (url, email), user_id)
+        return user_id
 
-    def _cabot_user_to_slack_user_id(self, url, headers, user):
-        # type: (str, Dict[str, str], User) -> str
+    def _get_user_list(self, url, headers):
+        # type: (str, Dict[str, str]) -> Dict[str, str]
+        """
+        Fetch the workspace user list and return an email -> user ID map (cached with a TTL).
+        :param url: slack api url
+        :param headers: auth headers
+        :return: dict mapping email to slack user ID
+        """
+        cached = _cache_get(_USER_LIST_CACHE, url)
+        if cached is not None:
+            return cached[1]
+
+        params = {'limit': 1000}
+        emails = {}  # type: Dict[str, str]
+        while True:
+            response = _SESSION.get(url + 'users.list', headers=headers, params=params)
+            data = _check_response(response)
+            for member in data['members']:
+                email = member.get('profile', {}).get('email')
+                if email:
+                    emails[email] = member['id']
+
+            # handle pagination
+            params['cursor'] = data.get('response_metadata', {}).get('next_cursor')
+            if not params['cursor']:
+                break
+
+        _cache_set(_USER_LIST_CACHE, url, emails)
+        return emails
+
+    def _cabot_user_to_slack_user_id(self, url, headers, user, override=None, email_map=None):
+        # type: (str, Dict[str, str], User, Optional[str], Optional[Dict[str, str]]) -> str
         """
         Map a Cabot user to their Slack user ID. Raises SlackAPIError if the user's email can't be found in Slack.
         :param url: slack api url
         :param headers: auth headers
         :param user: Cabot user
+        :param override: the user's slack_user_id_override, if any (prefetched in bulk by the caller)
+        :param email_map: email -> user ID map from _get_user_list, if the caller pre-warmed one
         :return: slack user ID
         """
-        # check for user ID override
-        # note some users might not have SlackAlertUserData objects created yet, so this may be empty list
-        for slack_data in SlackAlertUserData.objects.filter(user__user=user):
-            if slack_data.slack_user_id_override:
-                return slack_data.slack_user_id_override
+        if override:
+            return override
+        if email_map is not None and user.email in email_map:
+            return email_map[user.email]
         return self._email_to_slack_user_id(url, headers, user.email)
 
-    def _get_channel_members(self, url, headers, channel_id):
-        # type: (str, Dict[str, str], str) -> Set[str]
+    def _get_channel_members(self, url, headers, channel_id, target_user_ids=None):
+        # type: (str, Dict[str, str], str, Optional[Set[str]]) -> Set[str]
         """
         Get a list of user IDs who are in a channel.
         :param url: slack api url
         :param headers: auth headers
         :param channel_id: slack channel ID to get users from
+        :param target_user_ids: if set, stop paginating once all of these IDs have been
+                                seen (the returned set may then be incomplete)
         :return: set of user ID strings
         """
+        cached = _cache_get(_CHANNEL_MEMBERS_CACHE, (url, channel_id))
+        if cached is not None:
+            return cached[1]
 
         params = {
             'channel': channel_id,
+            'limit': 1000,  # slack's default page size is tiny; ask for the max
         }
 
-        user_ids = []
+        # accumulate straight into a set - a list would hold every member a
+        # second time just to be copied into a set at the end
+        members = set()  # type: Set[str]
+        complete = True
         while True:
-            response = requests.get(urljoin(url, 'conversations.members'), headers=headers, params=params)
-            _check_response(response)
-            user_ids += response.json()['members']
+            response = _SESSION.get(url + 'conversations.members', headers=headers, params=params)
+            data = _check_response(response)
+            members.update(data['members'])
 
             # handle pagination
-            params['cursor'] = response.json().get('response_metadata', {}).get('next_cursor')
+            params['cursor'] = data.get('response_metadata', {}).get('next_cursor')
             if not params['cursor']:
                 break
-        return set(user_ids)
+            if target_user_ids is not None and target_user_ids <= members:
+                # every ID the caller cares about has been seen; skip the rest
+                complete = False
+                break
+
+        if complete:
+            # don't cache partial listings from the early exit above
+            _cache_set(_CHANNEL_MEMBERS_CACHE, (url, channel_id), members)
+        return members
 
     def _join_channel(self, url, headers, channel_id):
         # type: (str, Dict[str, str], str) -> None
         # if the bot is already in channel, still succeeds
-        response = requests.post(urljoin(url, 'conversations.join'), headers=headers, json={
+        response = _SESSION.post(url + 'conversations.join', headers=headers, json={
             'channel': channel_id,
         })
         _check_response(response)
 
+    def _invite_to_channel(self, url, headers, channel_id, user_ids):
+        # type: (str, Dict[str, str], str, Iterable[str]) -> None
+        """
+        Invite the given user IDs to a channel. Raises SlackAPIError if any invite fails
+        (including if the users are already in the channel - callers handle that).
+        :param url: slack api endpoint
+        :param headers: HTTP headers (w/ access token)
+        :param channel_id: channel ID to add users to
+        :param user_ids: slack user IDs to invite
+        :return: None
+        """
+        response = _SESSION.post(url + 'conversations.invite', headers=headers, json={
+            'channel': channel_id,
+            'users': ','.join(user_ids)
+        })
+        try:
+            _check_response(response)
+        except SlackAPIError as e:
+            if e.error_type in ('not_in_channel', 'channel_not_found'):
+                # our view of the channel is stale
+                _cache_invalidate(_CHANNEL_MEMBERS_CACHE, (url, channel_id))
+                with _CACHE_LOCK:
+                    _JOINED_CHANNELS.discard((url, channel_id))
+            raise
+
+        # keep the cached member list in sync with the invites we just sent;
+        # store a new set rather than mutating the old one, which is shared
+        # with other threads via _get_channel_members
+        cached = _cache_get(_CHANNEL_MEMBERS_CACHE, (url, channel_id))
+        if cached is not None:
+            _cache_set(_CHANNEL_MEMBERS_CACHE, (url, channel_id), cached[1] | set(user_ids))
+
+    @staticmethod
+    def _invite_error_type(error):
+        # type: (Any) -> Optional[str]
+        """Pull the per-user error string out of a conversations.invite errors entry."""
+        return error.get('error') if isinstance(error, dict) else error
+
     def _ensure_channel_members(self, url, headers, channel_id, user_ids):
         # type: (str, Dict[str, str], str, List[str]) -> None
         """
@@ -163,17 +388,32 @@ class SlackAlert(AlertPlugin):
         if len(user_ids) == 0:
             return
 
-        user_ids_in_channel = self._get_channel_members(url, headers, channel_id)
-        missing_user_ids = list(set(user_ids) - user_ids_in_channel)
+        # optimistically invite everyone and treat already_in_channel as success;
+        # listing members first means paginating conversations.members (the most
+        # expensive call in the alert path for big channels) on every alert
+        try:
+            self._invite_to_channel(url, headers, channel_id, user_ids)
+            return
+        except SlackAPIError as e:
+            if e.error_type == 'already_in_channel':
+                return
+            errors = e.errors or []
+            if errors and all(self._invite_error_type(err) == 'already_in_channel' for err in errors):
+                return
+            if not errors:
+                raise
+
+        # some invites failed for other reasons; diff against the member list so
+        # we only retry (and report errors for) the users actually missing.
+        # ','.join and the invite accept any iterable, so no intermediate list
+        targets = frozenset(user_ids)
+        missing_user_ids = targets.difference(
+            self._get_channel_members(url, headers, channel_id, target_user_ids=targets))
 
-        if len(missing_user_ids) == 0:
+        if not missing_user_ids:
             return
 
-        response = requests.post(urljoin(url, 'conversations.invite'), headers=headers, json={
-            'channel': channel_id,
-            'users': ','.join(missing_user_ids)
-        })
-        _check_response(response)
+        self._invite_to_channel(url, headers, channel_id, missing_user_ids)
 
     def _upload_file(self, url, headers, file_name, file_data, channel_id, thread_ts, timeout_seconds=30):
         # type: (str, Dict[str, str], str, bytes, str, str, int) -> Dict[str, str]
@@ -188,15 +428,30 @@ class SlackAlert(AlertPlugin):
         :param timeout_seconds: timeout for uploading all files (default 30s)
         :return: a slack file object (dict from json)
         """
-        response = requests.post(
-            urljoin(url, 'files.upload'),
-            data={'filename': file_name, 'channels': channel_id, 'thread_ts': thread_ts},
-            files={'file': file_data},
-            headers=headers,
-            timeout=timeout_seconds,
-        )
-        _check_response(response)
-        return response.json()['file']
+        # the legacy files.upload endpoint is deprecated and pushes the whole
+        # multipart body through Slack's API gateway; the external-upload flow
+        # sends the bytes straight to storage instead
+        response = _SESSION.get(url + 'files.getUploadURLExternal', headers=headers, params={
+            'filename': file_name,
+            'length': len(file_data),
+        })
+        data = _check_response(response)
+        upload_url = data['upload_url']
+        file_id = data['file_id']
+
+        # raw bytes go to the pre-signed URL; no auth header, and the response
+        # is not a Slack API envelope
+        response = _SESSION.post(upload_url, data=file_data, timeout=timeout_seconds)
+        _check_response(response, check_ok=False)
+
+        response = _SESSION.post(url + 'files.completeUploadExternal', headers=headers, json={
+            'files': [{'id': file_id, 'title': file_name}],
+            'channel_id': channel_id,
+            'thread_ts': thread_ts,
+        })
+        # completeUploadExternal returns a list of files; keep the old
+        # single-file-dict return shape
+        return _check_response(response)['files'][0]
 
     def _post_message(self, url, headers, text, blocks, channel_id):
         # type: (str, Dict[str, str], str, List[Any], str) -> str
@@ -209,18 +464,22 @@ class SlackAlert(AlertPlugin):
         :param channel_id: channel to post to
         :return: the post's "ts" value (used for replies)
         """
-        response = requests.post(urljoin(url, 'chat.postMessage'), headers=headers, json={
+        # serialize the payload ourselves: compact separators shrink the body
+        # (the block tree dominates it for alerts with many failing checks)
+        # and sort_keys keeps the output deterministic
+        payload = json.dumps({
             'channel': channel_id,
             'text': text,  # this shows in notifications when using blocks
             'blocks': blocks,
-        })
-        _check_response(response)
-        return response.json()['ts']
+        }, sort_keys=True, separators=(',', ':'))
+        response = _SESSION.post(url + 'chat.postMessage',
+                                 headers=dict(headers, **{'Content-Type': 'application/json; charset=utf-8'}),
+                                 data=payload)
+        return _check_response(response)['ts']
 
     def send_alert(self, service, users, duty_officers):
         # type: (Service, Iterable[User], Iterable[User]) -> None
         include_mentions = True
-        users = list(users) + list(duty_officers)
 
         current_status = service.overall_status
         old_status = service.old_overall_status
@@ -252,30 +511,76 @@ class SlackAlert(AlertPlugin):
         url, headers, channel_id = _get_slack_api_for_service(service)
         failing_checks = list(service.all_failing_checks())
 
-        # ensure cabot is in channel
-        try:
-            self._join_channel(url, headers, channel_id)
-        except (requests.HTTPError, SlackAPIError) as e:
-            if isinstance(e, SlackAPIError) and e.error_type == 'method_not_supported_for_channel_type':
-                # private channel; someone must add the integration manually
-                pass
-            else:
-                logger.warning('Could not join channel %s: %s.', channel_id, e)
+        # ensure cabot is in channel; the join is independent of the user
+        # lookups below, so start it now and collect the result afterwards
+        # (skipped entirely if we already joined this channel this process)
+        join = None
+        with _CACHE_LOCK:
+            already_joined = (url, channel_id) in _JOINED_CHANNELS
+        if not already_joined:
+            join = _EXECUTOR.submit(self._join_channel, url, headers, channel_id)
 
         # map cabot users to slack user IDs
         user_ids = []  # type: List[str]
         # list of users that aren't found on slack and aren't ignored
         missing_users = []  # type: List[User]
-        for user in users:
+        # when we can't @mention anyone and there are no failing checks to
+        # report (e.g. WARNING-only transitions), the IDs would go unused, so
+        # skip materializing the user list and all the lookups
+        if include_mentions or failing_checks:
+            # dedupe (duty officers are often also subscribed as users) so each
+            # person is looked up and @mentioned at most once; keep order
+            deduped = []  # type: List[User]
+            seen = set()  # type: Set[int]
+            for user in list(users) + list(duty_officers):
+                if user.pk not in seen:
+                    seen.add(user.pk)
+                    deduped.append(user)
+            users = deduped
+
+            # fetch everyone's user ID overrides in one query instead of one per user
+            # note some users might not have SlackAlertUserData objects created yet, so this may be empty
+            overrides = dict(SlackAlertUserData.objects
+                             .filter(user__user__in=users)
+                             .exclude(slack_user_id_override='')
+                             .values_list('user__user_id', 'slack_user_id_override'))
+            # with several users to resolve by email, pre-warm the workspace user
+            # list once instead of issuing a rate-limited lookupByEmail call each
+            email_map = None  # type: Optional[Dict[str, str]]
+            if sum(1 for user in users if not overrides.get(user.pk)) >= USER_LIST_MIN_USERS:
+                try:
+                    email_map = self._get_user_list(url, headers)
+                except (requests.HTTPError, SlackAPIError) as e:
+                    logger.warning('Failed to fetch Slack user list, falling back to per-user lookups: %s', e)
+            # fan the lookups out; each one is a synchronous HTTP round-trip, so
+            # running them serially makes alert latency linear in the user count
+            lookups = [(user, _EXECUTOR.submit(self._cabot_user_to_slack_user_id, url, headers, user,
+                                               overrides.get(user.pk), email_map))
+                       for user in users]
+            for user, lookup in lookups:
+                try:
+                    user_id = lookup.result()
+                    if user_id != IGNORE_USER_ID:
+                        user_ids.append(user_id)
+                except (requests.HTTPError, SlackAPIError) as e:
+                    missing_users.append(user)
+                    if not (isinstance(e, SlackAPIError) and e.error_type == 'users_not_found'):
+                        logger.exception('Failed to find Slack user for Cabot user %s, got unexpected error %s.',
+                                         user, e.error_type)
+
+        if join is not None:
             try:
-                user_id = self._cabot_user_to_slack_user_id(url, headers, user)
-                if user_id != IGNORE_USER_ID:
-                    user_ids.append(user_id)
+                join.result()
+                with _CACHE_LOCK:
+                    _JOINED_CHANNELS.add((url, channel_id))
             except (requests.HTTPError, SlackAPIError) as e:
-                missing_users.append(user)
-                if not (isinstance(e, SlackAPIError) and e.error_type == 'users_not_found'):
-                    logger.exception('Failed to find Slack user for Cabot user %s, got unexpected error %s.',
-                                     user, e.error_type)
+                if isinstance(e, SlackAPIError) and e.error_type == 'method_not_supported_for_channel_type':
+                    # private channel; someone must add the integration manually
+                    # (joining will never work, so don't retry on later alerts)
+                    with _CACHE_LOCK:
+                        _JOINED_CHANNELS.add((url, channel_id))
+                else:
+                    logger.warning('Could not join channel %s: %s.', channel_id, e)
 
         # ensure users are in channel
         try:
@@ -283,6 +588,7 @@ class SlackAlert(AlertPlugin):
         except (SlackAPIError, requests.HTTPError) as e:
             logger.exception('Failed to add users to channel %s: %s', channel_id, e)
 
+        emoji = EMOJIS.get(current_status, '')
         blocks = [
             {
                 'type': 'header',
@@ -290,11 +596,15 @@ class SlackAlert(AlertPlugin):
                     'type': 'plain_text',
                     'text': '{emoji} {service} status is {status} {emoji}'.format(service=service.name,
                                                                                   status=current_status.upper(),
-                                                                                  emoji=EMOJIS.get(current_status, '')),
+                                                                                  emoji=emoji),
                 }
             }
         ]
-        for check in failing_checks:
+        # constant across checks; urljoin re-parses its base on every call
+        jenkins_base = urljoin(settings.JENKINS_API, '/')
+        # preallocate the per-check slots so the loop assigns instead of growing the list
+        blocks += [None] * len(failing_checks)
+        for i, check in enumerate(failing_checks):
             last_result = check.last_result()
             error = last_result.error if last_result else None  # type: Optional[str]
             check_link = build_absolute_url(reverse('check', kwargs={'pk': check.pk}))
@@ -305,13 +615,13 @@ class SlackAlert(AlertPlugin):
                 status_text = 'Grafana'
             elif check.check_category == 'Jenkins Check':
                 status_link = '{jenkins}job/{check_name}/{job_number}/console'.format(
-                    jenkins=urljoin(settings.JENKINS_API, '/'),
+                    jenkins=jenkins_base,
                     check_name=check.name,
                     job_number=last_result.job_number if last_result else None,
                 )
                 status_text = 'Jenkins'
 
-            blocks.append({
+            block = {
                 "type": "section",
                 "text": {
                     "type": "mrkdwn",
@@ -319,20 +629,15 @@ class SlackAlert(AlertPlugin):
                                                                    name=check.name.replace('>', '\\>'),
                                                                    error=error.replace('`', '\\`') if error else '')
                 },
-            })
+            }
+            blocks[1 + i] = block
 
             # add an accessory button that links to the check's link if present (i.e. Grafana)
             if status_link:
-                blocks[-1]["accessory"] = {
-                    "type": "button",
-                    "text": {
-                        "type": "plain_text",
-                        "text": status_text,
-                        "emoji": False,
-                    },
-                    "url": status_link,
-                    "action_id": "button-status"
-                }
+                button = _BUTTON_TEMPLATE.copy()
+                button["text"] = dict(_BUTTON_TEMPLATE["text"], text=status_text)
+                button["url"] = status_link
+                block["accessory"] = button
 
         # add @mentions
         if include_mentions:
@@ -379,18 +684,36 @@ class SlackAlert(AlertPlugin):
                                     blocks=blocks,
                                     channel_id=channel_id)
         except (SlackAPIError, requests.HTTPError) as e:
+            if isinstance(e, SlackAPIError) and e.error_type == 'not_in_channel':
+                # someone kicked the bot; re-join on the next alert
+                with _CACHE_LOCK:
+                    _JOINED_CHANNELS.discard((url, channel_id))
             logger.exception('Error posting message to Slack channel %s: %s', channel_id, e)
             raise
 
-        # Upload images for first 5 failing checks as replies to the main post
-        try:
-            for check in failing_checks[:5]:
-                image = check.get_status_image()
-                if image is not None:
-                    self._upload_file(url, headers, '{}.png'.format(check.name), image, channel_id, ts)
-        except (requests.HTTPError, SlackAPIError) as e:
-            # continue anyway, just don't put any images in the message
-            logger.exception('Failed to get/upload images to channel ID %s: %s', channel_id, e)
+        # Upload images for first 5 failing checks as replies to the main post;
+        # each files.upload takes hundreds of ms, so run them in parallel.
+        # Image generation (typically a blocking Grafana render) is also fanned
+        # out so it overlaps with the uploads instead of serializing with them.
+        images = [(check, _EXECUTOR.submit(check.get_status_image))
+                  for check in failing_checks[:5]]
+        uploads = []
+        for check, image_future in images:
+            try:
+                image = image_future.result()
+            except (requests.HTTPError, SlackAPIError) as e:
+                # continue anyway, just don't put this image in the message
+                logger.exception('Failed to get image for check %s: %s', check.name, e)
+                continue
+            if image is not None:
+                uploads.append(_EXECUTOR.submit(self._upload_file, url, headers,
+                                                '{}.png'.format(check.name), image, channel_id, ts))
+        for upload in uploads:
+            try:
+                upload.result()
+            except (requests.HTTPError, SlackAPIError) as e:
+                # continue anyway, just don't put this image in the message
+                logger.exception('Failed to upload image to channel ID %s: %s', channel_id, e)
 
 
 def validate_slack_user_id(slack_id):
@@ -1,13 +1,23 @@
 # -*- coding: utf-8 -*-
+import json
+
 from cabot.cabotapp.alert import AlertPlugin
 from cabot.cabotapp.models_plugins import SlackInstance
 from cabot.plugin_test_utils import PluginTestCase
-from mock import patch, call
+from mock import patch, call, Mock
 
 from cabot.cabotapp.models import Service
 from cabot_alert_slack import models
 
 
+def _slack_response(payload):
+    """Build a fake requests response whose .json() returns the given payload."""
+    response = Mock()
+    response.raise_for_status.return_value = None
+    response.json.return_value = payload
+    return response
+
+
 class TestSlackAlerts(PluginTestCase):
     def setUp(self):
         super(TestSlackAlerts, self).setUp()
@@ -30,6 +40,12 @@ class TestSlackAlerts(PluginTestCase):
         # self.user's service key is user_key
         models.SlackAlertUserData.objects.create(user=self.user.profile, slack_user_id_override='U123')
 
+        # module-level caches persist across tests; start each test cold
+        models._EMAIL_CACHE.clear()
+        models._CHANNEL_MEMBERS_CACHE.clear()
+        models._USER_LIST_CACHE.clear()
+        models._JOINED_CHANNELS.clear()
+
     def test_get_slack_api_for_service(self):
         url, headers, channel_id = models._get_slack_api_for_service(self.service)
         self.assertEqual(url, 'https://slack.com/api/')
@@ -38,12 +54,12 @@ class TestSlackAlerts(PluginTestCase):
         })
         self.assertEqual(channel_id, 'C456')
 
-    @patch('cabot_alert_slack.models.requests')
+    @patch('cabot_alert_slack.models._SESSION')
     @patch('cabot_alert_slack.models.SlackAlert._email_to_slack_user_id')
     @patch('cabot_alert_slack.models.SlackAlert._join_channel')
     @patch('cabot_alert_slack.models.SlackAlert._ensure_channel_members')
     @patch('cabot_alert_slack.models.SlackAlert._upload_file')
-    def test_passing_to_error(self, upload_file, ensure_members, join_channel, email_to_uid, requests):
+    def test_passing_to_error(self, upload_file, ensure_members, join_channel, email_to_uid, session):
         email_to_uid.side_effect = lambda url, headers, email: ('U' + email)
         self.run_checks([(self.es_check, False, False)], Service.PASSING_STATUS)
 
@@ -58,22 +74,25 @@ class TestSlackAlerts(PluginTestCase):
                  'C456',
                  ['U123', 'Udolores@affirm.com']),
         ])
-        requests.post.assert_has_calls([
-            call('https://slack.com/api/chat.postMessage', headers={'Authorization': 'Bearer SOME-TOKEN'},
-                 json={
-                     'channel': 'C456',
-                     'text': 'Service is ERROR',
-                     'blocks': [
-                         {'text': {'text': ':red_circle: Service status is ERROR :red_circle:', 'type': 'plain_text'},
-                          'type': 'header'},
-                         {'text': {'text': '*<http://localhost/check/10104/|ES Metric Check>* - ``', 'type': 'mrkdwn'},
-                          'type': 'section'},
-                         {
-                             'type': 'context',
-                             'elements': [{'text': '<@U123> <@Udolores@affirm.com> :point_up:', 'type': 'mrkdwn'}]
-                         }
-                     ]
-                 }),
+        expected_payload = {
+            'channel': 'C456',
+            'text': 'Service is ERROR',
+            'blocks': [
+                {'text': {'text': ':red_circle: Service status is ERROR :red_circle:', 'type': 'plain_text'},
+                 'type': 'header'},
+                {'text': {'text': '*<http://localhost/check/10104/|ES Metric Check>* - ``', 'type': 'mrkdwn'},
+                 'type': 'section'},
+                {
+                    'type': 'context',
+                    'elements': [{'text': '<@U123> <@Udolores@affirm.com> :point_up:', 'type': 'mrkdwn'}]
+                }
+            ]
+        }
+        session.post.assert_has_calls([
+            call('https://slack.com/api/chat.postMessage',
+                 headers={'Authorization': 'Bearer SOME-TOKEN',
+                          'Content-Type': 'application/json; charset=utf-8'},
+                 data=json.dumps(expected_payload, sort_keys=True, separators=(',', ':'))),
             call().raise_for_status(),
         ])
 
@@ -127,6 +146,104 @@ class TestSlackAlerts(PluginTestCase):
                 channel_id='C456')
         ])
 
+    @patch('cabot_alert_slack.models._SESSION')
+    def test_ensure_members_already_in_channel(self, session):
+        session.post.return_value = _slack_response({'ok': False, 'error': 'already_in_channel'})
+
+        self.plugin._ensure_channel_members('https://slack.com/api/', {'Authorization': 'Bearer SOME-TOKEN'},
+                                            'C456', ['U1', 'U2'])
+
+        # one optimistic invite, and no conversations.members listing
+        self.assertEqual(session.post.call_count, 1)
+        session.get.assert_not_called()
+
+    @patch('cabot_alert_slack.models._SESSION')
+    def test_ensure_members_per_user_already_in_channel(self, session):
+        session.post.return_value = _slack_response({
+            'ok': False,
+            'error': 'invite_failed',
+            'errors': [{'user': 'U1', 'ok': False, 'error': 'already_in_channel'},
+                       {'user': 'U2', 'ok': False, 'error': 'already_in_channel'}],
+        })
+
+        self.plugin._ensure_channel_members('https://slack.com/api/', {'Authorization': 'Bearer SOME-TOKEN'},
+                                            'C456', ['U1', 'U2'])
+
+        self.assertEqual(session.post.call_count, 1)
+        session.get.assert_not_called()
+
+    @patch('cabot_alert_slack.models._SESSION')
+    def test_ensure_members_mixed_errors_falls_back_to_diff(self, session):
+        session.post.side_effect = [
+            _slack_response({
+                'ok': False,
+                'error': 'invite_failed',
+                'errors': [{'user': 'U1', 'ok': False, 'error': 'already_in_channel'},
+                           {'user': 'U2', 'ok': False, 'error': 'cant_invite'}],
+            }),
+            _slack_response({'ok': True}),
+        ]
+        session.get.return_value = _slack_response({'ok': True, 'members': ['U1'], 'response_metadata': {}})
+
+        self.plugin._ensure_channel_members('https://slack.com/api/', {'Authorization': 'Bearer SOME-TOKEN'},
+                                            'C456', ['U1', 'U2'])
+
+        # the fallback listed the members once, then re-invited only the missing user
+        self.assertEqual(session.get.call_count, 1)
+        self.assertEqual(session.post.call_count, 2)
+        retry_kwargs = session.post.call_args_list[1][1]
+        self.assertEqual(retry_kwargs['json'], {'channel': 'C456', 'users': 'U2'})
+        # the cached member list reflects the successful invite
+        cache_key = ('https://slack.com/api/', 'C456')
+        self.assertEqual(models._CHANNEL_MEMBERS_CACHE[cache_key][1], {'U1', 'U2'})
+
+    @patch('cabot_alert_slack.models._SESSION')
+    def test_ensure_members_invalidates_stale_cache(self, session):
+        cache_key = ('https://slack.com/api/', 'C456')
+        for error in ('not_in_channel', 'channel_not_found'):
+            models._cache_set(models._CHANNEL_MEMBERS_CACHE, cache_key, {'U9'})
+            session.post.return_value = _slack_response({'ok': False, 'error': error})
+
+            with self.assertRaises(models.SlackAPIError):
+                self.plugin._ensure_channel_members('https://slack.com/api/',
+                                                    {'Authorization': 'Bearer SOME-TOKEN'},
+                                                    'C456', ['U1'])
+
+            self.assertNotIn(cache_key, models._CHANNEL_MEMBERS_CACHE)
+
+    @patch('cabot_alert_slack.models._SESSION')
+    def test_upload_file(self, session):
+        session.get.return_value = _slack_response({
+            'ok': True,
+            'upload_url': 'https://files.slack.com/upload/v1/ABC123',
+            'file_id': 'F123',
+        })
+        session.post.side_effect = [
+            _slack_response({'ok': True}),  # raw upload; body isn't a slack API envelope
+            _slack_response({'ok': True, 'files': [{'id': 'F123', 'title': 'check.png'}]}),
+        ]
+
+        result = self.plugin._upload_file('https://slack.com/api/', {'Authorization': 'Bearer SOME-TOKEN'},
+                                          'check.png', b'pngbytes', 'C456', '123.456')
+
+        session.get.assert_called_once_with('https://slack.com/api/files.getUploadURLExternal',
+                                            headers={'Authorization': 'Bearer SOME-TOKEN'},
+                                            params={'filename': 'check.png', 'length': 8})
+        # the raw bytes go to the pre-signed URL with no auth header
+        upload_args, upload_kwargs = session.post.call_args_list[0]
+        self.assertEqual(upload_args, ('https://files.slack.com/upload/v1/ABC123',))
+        self.assertEqual(upload_kwargs, {'data': b'pngbytes', 'timeout': 30})
+        session.post.assert_has_calls([
+            call('https://slack.com/api/files.completeUploadExternal',
+                 headers={'Authorization': 'Bearer SOME-TOKEN'},
+                 json={
+                     'files': [{'id': 'F123', 'title': 'check.png'}],
+                     'channel_id': 'C456',
+                     'thread_ts': '123.456',
+                 }),
+        ])
+        self.assertEqual(result, {'id': 'F123', 'title': 'check.png'})
+
     @patch('cabot_alert_slack.models.SlackAlert._post_message')
     def test_acked_to_acked(self, send_alert):
         self.transition_service_status(Service.ACKED_STATUS, Service.ACKED_STATUS)